@@ -1,18 +1,37 @@
 """Routes for downloading client summary reports."""
 
 from fastapi import APIRouter, Depends, Body
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from db import get_db
-from services.client_summary_download_service import client_summary_download_service
+from services.client_summary_download_service import (
+    client_summary_download_service,
+    get_memory_cached_latest_export,
+)
 from utils.dependencies import get_current_user
+from schemas.clientsummaryschema import ClientSummaryRequest
 
 router = APIRouter(prefix="/client-summary")
 
+CHUNK_SIZE = 64 * 1024
+XLSX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument."
+    "spreadsheetml.sheet"
+)
+CONTENT_DISPOSITION = 'attachment; filename="client_summary.xlsx"'
+
+
+def _iter_chunks(buffer):
+    """Yield the buffer contents in fixed-size chunks."""
+    buffer.seek(0)
+    while chunk := buffer.read(CHUNK_SIZE):
+        yield chunk
+
 
 @router.post("/download")
-def download_client_summary_excel(
-    payload: dict = Body(
+async def download_client_summary_excel(
+    payload: ClientSummaryRequest = Body(
         ...,
         example={
             "clients": "ALL",
@@ -40,15 +59,26 @@ def download_client_summary_excel(
 
     Delegates all logic to the service layer `client_summary_download_service`.
     
-    Returns a FileResponse with the generated Excel file.
+    The workbook is built in a worker thread and streamed back in chunks.
+    A latest-month workbook already held in memory is returned directly;
+    the disk-cached copy is loaded in the worker thread.
     """
-    file_path = client_summary_download_service(db=db, payload=payload)
-
-    return FileResponse(
-        path=file_path,
-        filename="client_summary.xlsx",
-        media_type=(
-            "application/vnd.openxmlformats-officedocument."
-            "spreadsheetml.sheet"
-        ),
+    filters = payload.model_dump(exclude_none=True)
+
+    blob = get_memory_cached_latest_export(filters)
+    if blob is not None:
+        return Response(
+            content=blob,
+            media_type=XLSX_MEDIA_TYPE,
+            headers={"Content-Disposition": CONTENT_DISPOSITION},
+        )
+
+    buffer = await run_in_threadpool(
+        client_summary_download_service, db=db, payload=filters
+    )
+
+    return StreamingResponse(
+        _iter_chunks(buffer),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": CONTENT_DISPOSITION},
     )
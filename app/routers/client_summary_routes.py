@@ -4,11 +4,14 @@ Supports month, quarter, range, employee, and account manager filters.
 """
 
 from fastapi import APIRouter, Depends, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from db import get_db
 from utils.dependencies import get_current_user
 from services.client_summary_service import client_summary_service
+from schemas.clientsummaryschema import ClientSummaryRequest
 
 router = APIRouter(
     prefix="/client-summary",
@@ -18,17 +21,18 @@ router = APIRouter(
 
 @router.post(
     "",
+    response_class=ORJSONResponse,
     summary="Get client summary",
     description=(
         "Returns client summary based on filters like clients, "
         "date range, employee, and account manager."
     ),
 )
-def client_summary(
-    payload: dict = Body(
-        default={},
+async def client_summary(
+    payload: ClientSummaryRequest | None = Body(
+        default=None,
         example={
-            "emp_id": ["IN01804611"],
+            "emp_id": "IN01804611",
             "account_manager": ["John Doe"],
             "clients": "ALL",
             "selected_year": "YYYY",
@@ -53,4 +57,5 @@ def client_summary(
     Delegates all data retrieval and aggregation to
     `client_summary_service`.
     """
-    return client_summary_service(db=db, payload=payload)
+    filters = payload.model_dump(exclude_none=True) if payload else {}
+    return await run_in_threadpool(client_summary_service, db=db, payload=filters)
@@ -3,6 +3,8 @@ Routes for department-wise summary data.
 """
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from db import get_db
 from services.department_summary_service import (
@@ -12,8 +14,8 @@ from utils.dependencies import get_current_user
 router = APIRouter(prefix="/department-summary")
 
 
-@router.get("/")
-def department_summary(
+@router.get("/", response_class=ORJSONResponse)
+async def department_summary(
     month: str = Query(
         ...,
         description="Provide month like YYYY-MM"
@@ -22,5 +24,5 @@ def department_summary(
     _current_user=Depends(get_current_user)
 ):
     """Return department summary for the given month."""
-    summary = get_department_summary(db, month)
+    summary = await run_in_threadpool(get_department_summary, db, month)
     return summary
@@ -13,7 +13,7 @@ from services.display_service import (update_shift_service,
                                       generate_employee_shift_excel,
                                       fetch_shift_data)
 from utils.dependencies import get_current_user
-from utils.client_enums import Company, generate_unique_colors
+from utils.client_enums import Company, COMPANY_COLORS
 
 router = APIRouter(prefix="/display")
 
@@ -94,7 +94,6 @@ def display_account_manger(
     names = [name[0] for name in account_managers]
     return {"account_managers":names}
 
-COLOR_MAP = generate_unique_colors(Company)
 @router.get("/client-enum")
 def get_client_enum(
     _current_user=Depends(get_current_user),
@@ -103,7 +102,7 @@ def get_client_enum(
     return {
         company.value: {
             "value": company.name.replace("_", " "),
-            "hexcode": COLOR_MAP[company],
+            "hexcode": COMPANY_COLORS[company],
         }
         for company in Company
     }
@@ -5,7 +5,9 @@ Routes for exporting filtered shift data as Excel files.
 
 import io
 
+import xlsxwriter
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
@@ -15,8 +17,23 @@ from utils.dependencies import get_current_user
 
 router = APIRouter(prefix="/excel", tags=["Excel Data"])
 
+
+def _to_excel_stream(columns, rows) -> io.BytesIO:
+    """Write header and rows into an in-memory XLSX stream."""
+    file_stream = io.BytesIO()
+    # constant_memory flushes each row as it is written; in_memory would disable it
+    workbook = xlsxwriter.Workbook(file_stream, {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Shifts")
+    worksheet.write_row(0, 0, columns)
+    for row_idx, row in enumerate(rows, start=1):
+        worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+    file_stream.seek(0)
+    return file_stream
+
+
 @router.get("/download")
-def download_excel(
+async def download_excel(
     emp_id: str | None = Query(None),
     account_manager: str | None = Query(None),
     department: str | None = Query(None),
@@ -28,7 +45,8 @@ def download_excel(
 ):
     """Download filtered shift data as an Excel file."""
 
-    df = export_filtered_excel(
+    columns, rows = await run_in_threadpool(
+        export_filtered_excel,
         db=db,
         emp_id=emp_id,
         account_manager=account_manager,
@@ -38,9 +56,7 @@ def download_excel(
         client=client
     )
 
-    file_stream = io.BytesIO()
-    df.to_excel(file_stream, index=False)
-    file_stream.seek(0)
+    file_stream = await run_in_threadpool(_to_excel_stream, columns, rows)
 
     return StreamingResponse(
         file_stream,
@@ -1,10 +1,13 @@
 """Routes for fetching employee shift details."""
 
 from fastapi import APIRouter, Depends, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from db import get_db
 from services.search_service import export_filtered_excel
 from utils.dependencies import get_current_user
+from schemas.searchschema import EmployeeSearchRequest
 
 router = APIRouter(
     prefix="/employee-details",
@@ -12,12 +15,12 @@ router = APIRouter(
 )
 
 
-@router.post("/search")
-def fetch_employee_details(
-    payload: dict = Body(..., example={
+@router.post("/search", response_class=ORJSONResponse)
+async def fetch_employee_details(
+    payload: EmployeeSearchRequest = Body(..., example={
         "emp_id": "IN01804611",
         "account_manager": "John Doe",
-        "clients": "ALL",
+        "client": "ALL",
         "department": "Infra - IT Operations",
         "start_month": "YYYY-MM",
         "end_month": "YYYY-MM",
@@ -48,17 +51,8 @@ def fetch_employee_details(
     Returns:
         dict: Employee shift details including shift-wise allowances and totals.
     """
-    return export_filtered_excel(
+    return await run_in_threadpool(
+        export_filtered_excel,
         db=db,
-        emp_id=payload.get("emp_id"),
-        account_manager=payload.get("account_manager"),
-        start_month=payload.get("start_month"),
-        end_month=payload.get("end_month"),
-        start=payload.get("start", 0),
-        limit=payload.get("limit", 10),
-        clients=payload.get("client"),
-        department=payload.get("department"),
-        selected_year=payload.get("selected_year"),
-        selected_months=payload.get("selected_months", []),
-        selected_quarters=payload.get("selected_quarters", [])
+        **payload.model_dump(),
     )
@@ -11,6 +11,8 @@ Temporary files are managed through a shared upload service.
 """
 
 import os
+from pathlib import Path
+
 from fastapi import APIRouter, UploadFile, Depends, HTTPException, Request
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
@@ -21,6 +23,8 @@ from schemas.displayschema import CorrectedRowsRequest
 
 router = APIRouter(prefix="/upload")
 
+TEMP_FOLDER_PATH = Path(TEMP_FOLDER).resolve()
+
 
 # Upload Endpoint
 @router.post("/")
@@ -75,14 +79,22 @@ async def download_error_file(filename: str, _current_user=Depends(get_current_u
     Raises:
         HTTPException: If the requested file does not exist.
     """
-    file_path = os.path.join(TEMP_FOLDER, filename)
-    if not os.path.exists(file_path):
+    file_path = (TEMP_FOLDER_PATH / filename).resolve()
+    if not file_path.is_relative_to(TEMP_FOLDER_PATH):
         raise HTTPException(status_code=404, detail="File not found")
 
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="File not found") from exc
+
+    # Reusing the stat result spares FileResponse a second stat before sendfile
     return FileResponse(
         file_path,
+        stat_result=stat_result,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        filename=filename
+        filename=filename,
+        content_disposition_type="attachment",
     )
 
 @router.post("/correct_error_rows")
@@ -5,13 +5,28 @@ This module initializes the FastAPI app, configures CORS middleware,
 creates database tables, and registers all API routes.
 """
 
+import os
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 from db import Base,engine
 from app import route
 
+# Unset keeps anyio's default; DB back-pressure comes from the engine pool in db.py
+THREADPOOL_SIZE = os.getenv("THREADPOOL_SIZE")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Size the worker thread pool used by run_in_threadpool handlers, if configured."""
+    if THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = int(THREADPOOL_SIZE)
+    yield
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 Base.metadata.create_all(bind=engine)
 origins = [
     "http://localhost:5173",  
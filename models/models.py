@@ -8,7 +8,7 @@ shift allowances, shift mappings, and shift amount configurations.
 # pylint: disable=too-few-public-methods,not-callable
 from sqlalchemy import (
     Column, Integer, String, Text, TIMESTAMP, Numeric, func,
-    ForeignKey,UniqueConstraint,Date,CheckConstraint,Float
+    ForeignKey,UniqueConstraint,Date,CheckConstraint,Float,Index
 )
 from sqlalchemy.orm import relationship
 from db import Base
@@ -78,6 +78,26 @@ class ShiftAllowances(Base):
     __table_args__ = (
         UniqueConstraint('duration_month', 'payroll_month', 'emp_id','client',
                          name='uix_payroll_employee'),
+        # Client summary matches lower(client) and lower(department) within a month window
+        Index('ix_shift_allowances_client_dept_month',
+              func.lower(client), func.lower(department), 'duration_month'),
+        # Case-insensitive emp_id filter; lower(client) and lower(department) are
+        # served by the leading columns of ix_shift_allowances_client_dept_month
+        Index('ix_sa_lower_emp_id', func.lower(emp_id)),
+        # Month-window filters narrowed by client and account manager
+        Index('ix_sa_dm_client_am', 'duration_month', 'client', 'account_manager'),
+        # The '%term%' ILIKE searches are served by trigram indexes that are not
+        # created here, since they need the pg_trgm extension. Run once per
+        # database as a role allowed to create extensions:
+        #   CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        #   CREATE INDEX IF NOT EXISTS ix_sa_client_trgm
+        #       ON shift_allowances USING gin (client gin_trgm_ops);
+        #   CREATE INDEX IF NOT EXISTS ix_sa_dept_trgm
+        #       ON shift_allowances USING gin (department gin_trgm_ops);
+        #   CREATE INDEX IF NOT EXISTS ix_sa_emp_trgm
+        #       ON shift_allowances USING gin (emp_id gin_trgm_ops);
+        #   CREATE INDEX IF NOT EXISTS ix_sa_account_manager_trgm
+        #       ON shift_allowances USING gin (account_manager gin_trgm_ops);
     )
 
 
@@ -109,6 +129,8 @@ class ShiftMapping(Base):
     # Optional: ensure days is non-negative
     __table_args__ = (
         CheckConstraint('days >= 0', name='chk_days_non_negative'),
+        # Mappings are fetched by parent allowance id and summed per shift type
+        Index('ix_sm_sa_id_shift_type', shiftallowance_id, func.upper(shift_type)),
     )
 
     shift_allowance = relationship("ShiftAllowances", back_populates="shift_mappings")
@@ -5,7 +5,7 @@ This module defines Pydantic models used for authentication-related
 API requests such as user login and access token refresh.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 class LoginRequest(BaseModel):
     """
     Login request payload.
@@ -14,6 +14,8 @@ class LoginRequest(BaseModel):
         email (str): Registered user email address.
         password (str): Plain-text user password.
     """
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     email: str
     password: str
 
@@ -25,4 +27,6 @@ class RefreshTokenRequest(BaseModel):
         refresh_token (str): Valid refresh token used to issue
             a new access token.
     """
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True, frozen=True)
+
     refresh_token: str
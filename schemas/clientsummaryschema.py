@@ -0,0 +1,29 @@
+"""
+Client summary request schemas.
+
+This module defines the Pydantic model used to validate the filter
+payload shared by the client summary and client summary download APIs.
+"""
+
+from typing import Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ClientSummaryRequest(BaseModel):
+    """
+    Client summary filter payload.
+
+    `clients` is either "ALL" or a mapping of client name to a list of
+    departments; a null department list selects every department of that
+    client. `account_manager` accepts a single name or a list of names.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    clients: Optional[Union[Literal["ALL"], Dict[str, Optional[List[str]]]]] = None
+    emp_id: Optional[str] = None
+    account_manager: Optional[Union[str, List[str]]] = None
+    start_month: Optional[str] = None
+    end_month: Optional[str] = None
+    selected_year: Optional[Union[int, str]] = None
+    selected_months: List[Union[int, str]] = Field(default_factory=list)
+    selected_quarters: List[str] = Field(default_factory=list)
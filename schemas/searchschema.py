@@ -0,0 +1,33 @@
+"""
+Employee search request schemas.
+
+This module defines the Pydantic model used to validate the filter
+payload of the employee shift details search API.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class EmployeeSearchRequest(BaseModel):
+    """
+    Employee shift details search payload.
+
+    Field names match the keyword arguments of the search service so the
+    validated model can be unpacked straight into it. The single-client
+    filter is only accepted as `client` and exposed as `clients`; a
+    `clients` key in the body is ignored.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    emp_id: Optional[str] = None
+    account_manager: Optional[str] = None
+    start_month: Optional[str] = None
+    end_month: Optional[str] = None
+    start: int = Field(0, ge=0)
+    limit: int = Field(10, ge=1)
+    clients: Optional[str] = Field(default=None, alias="client")
+    department: Optional[str] = None
+    selected_year: Optional[str] = None
+    selected_months: List[str] = Field(default_factory=list)
+    selected_quarters: List[str] = Field(default_factory=list)
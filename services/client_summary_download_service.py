@@ -5,116 +5,184 @@ This module converts client summary analytics into a structured
 Excel export with optional caching for latest-month requests.
 """
 
+import io
 import os
-from datetime import date, datetime
 from typing import Dict, List
+from zipfile import ZIP_DEFLATED, ZipFile
 
-import pandas as pd
 from fastapi import HTTPException
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.writer.excel import ExcelWriter
 from sqlalchemy.orm import Session
-from diskcache import Cache
-
 
 from services.client_summary_service import (
     client_summary_service,
     is_default_latest_month_request,
-    LATEST_MONTH_KEY,
+)
+from utils.summary_cache import (
+    cache,
+    xlsx_bytes_cache,
     CACHE_TTL,
+    LATEST_EXCEL_KEY,
+    LATEST_MONTH_KEY,
 )
 
-
-cache = Cache("./diskcache/latest_month")
-
 EXPORT_DIR = "exports"
 DEFAULT_EXPORT_FILE = "client_summary_latest.xlsx"
+os.makedirs(EXPORT_DIR, exist_ok=True)
+
+EXPORT_COLUMNS = [
+    "Period",
+    "Client",
+    "Client Partner",
+    "Employee ID",
+    "Department",
+    "Head Count",
+    "Shift A",
+    "Shift B",
+    "Shift C",
+    "Shift PRIME",
+    "Total Allowance",
+]
+CURRENCY_COLUMNS = [
+    "Shift A",
+    "Shift B",
+    "Shift C",
+    "Shift PRIME",
+    "Total Allowance",
+]
+CURRENCY_INDEXES = frozenset(EXPORT_COLUMNS.index(col) for col in CURRENCY_COLUMNS)
+CURRENCY_FORMAT = '"₹"#,##0'
+# Sheet XML compresses almost as well at level 1 as at the default 6, for far less CPU
+ZIP_COMPRESSION_LEVEL = 1
+
+
+def _load_latest_export() -> bytes | None:
+    """Return the cached latest-month XLSX bytes, filling memory from disk."""
+    blob = xlsx_bytes_cache.get(LATEST_MONTH_KEY)
+    if blob is None:
+        cached = cache.get(LATEST_EXCEL_KEY)
+        if cached and os.path.exists(cached["file_path"]):
+            with open(cached["file_path"], "rb") as fh:
+                blob = fh.read()
+            xlsx_bytes_cache[LATEST_MONTH_KEY] = blob
 
+    return blob
 
 
+def get_memory_cached_latest_export(payload: dict) -> bytes | None:
+    """
+    Return in-memory XLSX bytes for the default latest-month request, if any.
 
-def _format_currency(value: float) -> str:
-    """Format numeric value as INR currency."""
-    return f"₹{value:,.0f}"
+    Only the process-local cache is checked, so async handlers can call this
+    without blocking; the diskcache and file fallback runs in the service.
+    """
+    if not is_default_latest_month_request(payload or {}):
+        return None
+    return xlsx_bytes_cache.get(LATEST_MONTH_KEY)
 
 
 def _append_department_row(
-    rows: List[Dict],
+    rows: List[tuple],
     period: str,
     client: str,
     partner: str,
     dept_name: str,
     dept_block: Dict,
 ) -> None:
-    """Append a department-level row."""
+    """Append a department-level row in EXPORT_COLUMNS order."""
     rows.append(
-        {
-            "Period": period,
-            "Client": client,
-            "Client Partner": partner,
-            "Employee ID": "",
-            "Department": dept_name,
-            "Head Count": dept_block.get("dept_head_count", 0),
-            "Shift A": _format_currency(dept_block.get("dept_A", 0)),
-            "Shift B": _format_currency(dept_block.get("dept_B", 0)),
-            "Shift C": _format_currency(dept_block.get("dept_C", 0)),
-            "Shift PRIME": _format_currency(dept_block.get("dept_PRIME", 0)),
-            "Total Allowance": _format_currency(dept_block.get("dept_total", 0)),
-        }
+        (
+            period,
+            client,
+            partner,
+            "",
+            dept_name,
+            dept_block.get("dept_head_count", 0),
+            dept_block.get("dept_A", 0),
+            dept_block.get("dept_B", 0),
+            dept_block.get("dept_C", 0),
+            dept_block.get("dept_PRIME", 0),
+            dept_block.get("dept_total", 0),
+        )
     )
 
 
 def _append_employee_row(
-    rows: List[Dict],
+    rows: List[tuple],
     period: str,
     client: str,
     dept_name: str,
     emp: Dict,
     dept_block: Dict,
-    partner_fallback: str,
+    partner: str,
 ) -> None:
-    """Append an employee-level row."""
+    """Append an employee-level row in EXPORT_COLUMNS order."""
     rows.append(
-        {
-            "Period": period,
-            "Client": client,
-            "Client Partner": emp.get("account_manager", partner_fallback),
-            "Employee ID": emp.get("emp_id", ""),
-            "Department": dept_name,
-            "Head Count": 1,
-            "Shift A": _format_currency(emp.get("A", dept_block.get("dept_A", 0))),
-            "Shift B": _format_currency(emp.get("B", dept_block.get("dept_B", 0))),
-            "Shift C": _format_currency(emp.get("C", dept_block.get("dept_C", 0))),
-            "Shift PRIME": _format_currency(
-                emp.get("PRIME", dept_block.get("dept_PRIME", 0))
-            ),
-            "Total Allowance": _format_currency(
-                emp.get("total", dept_block.get("dept_total", 0))
-            ),
-        }
+        (
+            period,
+            client,
+            partner,
+            emp.get("emp_id", ""),
+            dept_name,
+            1,
+            emp.get("A", dept_block.get("dept_A", 0)),
+            emp.get("B", dept_block.get("dept_B", 0)),
+            emp.get("C", dept_block.get("dept_C", 0)),
+            emp.get("PRIME", dept_block.get("dept_PRIME", 0)),
+            emp.get("total", dept_block.get("dept_total", 0)),
+        )
     )
 
 
-def _write_excel(df: pd.DataFrame, payload: dict) -> str:
-    """Write DataFrame to Excel and return file path."""
-    os.makedirs(EXPORT_DIR, exist_ok=True)
+def _currency_cell(ws, value: float) -> WriteOnlyCell:
+    """Build a numeric cell rendered as INR currency."""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.number_format = CURRENCY_FORMAT
+    return cell
+
+
+def _save_workbook(wb: Workbook, target) -> None:
+    """Save the workbook as a ZIP using the fast compression level."""
+    archive = ZipFile(
+        target,
+        "w",
+        ZIP_DEFLATED,
+        allowZip64=True,
+        compresslevel=ZIP_COMPRESSION_LEVEL,
+    )
+    ExcelWriter(wb, archive).save()
 
-    if is_default_latest_month_request(payload):
-        file_path = os.path.join(EXPORT_DIR, DEFAULT_EXPORT_FILE)
-    else:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_path = os.path.join(
-            EXPORT_DIR,
-            f"client_summary_{timestamp}.xlsx",
-        )
 
-    with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Client Summary")
+def _write_excel(rows: List[tuple], is_default: bool) -> io.BytesIO:
+    """Write export rows to an in-memory Excel buffer and return it."""
+    buffer = io.BytesIO()
 
-    return file_path
+    # write_only streams rows to XML instead of holding every cell in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Client Summary")
+    ws.append(EXPORT_COLUMNS)
 
+    # Amounts stay numeric; Excel renders them through the number format
+    for row in rows:
+        ws.append(
+            [
+                _currency_cell(ws, value) if idx in CURRENCY_INDEXES else value
+                for idx, value in enumerate(row)
+            ]
+        )
+    _save_workbook(wb, buffer)
 
+    if is_default:
+        with open(os.path.join(EXPORT_DIR, DEFAULT_EXPORT_FILE), "wb") as fh:
+            fh.write(buffer.getvalue())
 
+    buffer.seek(0)
+    return buffer
 
-def client_summary_download_service(db: Session, payload: dict) -> str:
+
+def client_summary_download_service(db: Session, payload: dict) -> io.BytesIO:
     """
     Generate and export client summary Excel.
 
@@ -125,11 +193,12 @@ def client_summary_download_service(db: Session, payload: dict) -> str:
     """
 
     payload = payload or {}
+    is_default = is_default_latest_month_request(payload)
 
-    if is_default_latest_month_request(payload):
-        cached = cache.get(f"{LATEST_MONTH_KEY}:excel")
-        if cached and os.path.exists(cached["file_path"]):
-            return cached["file_path"]
+    if is_default:
+        blob = _load_latest_export()
+        if blob is not None:
+            return io.BytesIO(blob)
 
     emp_filter = payload.get("emp_id")
     manager_filter = payload.get("account_manager")
@@ -138,19 +207,21 @@ def client_summary_download_service(db: Session, payload: dict) -> str:
     if not summary_data:
         raise HTTPException(404, "No data available")
 
-    rows: List[Dict] = []
+    rows: List[tuple] = []
 
+    # Rows are appended in final Period/Client/Department/Employee ID order;
+    # YYYY-MM period keys sort chronologically as plain strings
     for period_key in sorted(summary_data):
         period_data = summary_data[period_key]
         clients = period_data.get("clients")
         if not clients:
             continue
 
-        for client_name, client_block in clients.items():
+        for client_name, client_block in sorted(clients.items()):
             partner_value = client_block.get("account_manager", "")
             departments = client_block.get("departments", {})
 
-            for dept_name, dept_block in departments.items():
+            for dept_name, dept_block in sorted(departments.items()):
                 employees = dept_block.get("employees", [])
 
                 if not employees:
@@ -167,7 +238,7 @@ def client_summary_download_service(db: Session, payload: dict) -> str:
                     )
                     continue
 
-                for emp in employees:
+                for emp in sorted(employees, key=lambda e: e.get("emp_id") or ""):
                     if emp_filter and emp_filter != emp.get("emp_id"):
                         continue
 
@@ -182,29 +253,23 @@ def client_summary_download_service(db: Session, payload: dict) -> str:
                         dept_name,
                         emp,
                         dept_block,
-                        partner_value,
+                        emp_manager,
                     )
 
     if not rows:
         raise HTTPException(404, "No data available for export")
 
-    df = pd.DataFrame(rows)
-    df["Period"] = pd.to_datetime(df["Period"], format="%Y-%m")
-    df = df.sort_values(
-        by=["Period", "Client", "Department", "Employee ID"]
-    )
-    df["Period"] = df["Period"].dt.strftime("%Y-%m")
-
-    file_path = _write_excel(df, payload)
+    buffer = _write_excel(rows, is_default)
 
-    if is_default_latest_month_request(payload):
+    if is_default:
         cache.set(
-            f"{LATEST_MONTH_KEY}:excel",
+            LATEST_EXCEL_KEY,
             {
-                "_cached_month": df["Period"].iloc[0],
-                "file_path": file_path,
+                "_cached_month": rows[0][0],
+                "file_path": os.path.join(EXPORT_DIR, DEFAULT_EXPORT_FILE),
             },
             expire=CACHE_TTL,
         )
+        xlsx_bytes_cache[LATEST_MONTH_KEY] = buffer.getvalue()
 
-    return file_path
+    return buffer
@@ -6,37 +6,55 @@ This module aggregates shift allowance data across clients, departments,
 employees, and time periods with optional caching for latest-month queries.
 """
 
-from datetime import date, datetime
+from datetime import date
 from typing import List, Dict, Optional
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, cast, Integer, extract
+from sqlalchemy import func, and_, or_, any_, cast, select, Integer, extract
+from sqlalchemy.dialects.postgresql import array
 
 from models.models import ShiftAllowances, ShiftMapping, ShiftsAmount
-from diskcache import Cache
-
-
-cache = Cache("./diskcache/latest_month")
-LATEST_MONTH_KEY = "client_summary:latest_month"
-CACHE_TTL = 24 * 60 * 60
+from utils.month_filters import duration_month_filter
+from utils.summary_cache import (
+    cache,
+    summary_cache_key,
+    CACHE_TTL,
+    LATEST_DURATION_MONTH_KEY,
+    LATEST_DURATION_MONTH_TTL,
+    LATEST_MONTH_KEY,
+    SUMMARY_CACHE_TTL,
+)
+
+# Zeroed shift totals and prefixed keys, built once instead of per row
+EMPTY_SHIFT_TOTALS = {"A": 0.0, "B": 0.0, "C": 0.0, "PRIME": 0.0}
+CLIENT_SHIFT_KEYS = {k: f"client_{k}" for k in EMPTY_SHIFT_TOTALS}
+DEPT_SHIFT_KEYS = {k: f"dept_{k}" for k in EMPTY_SHIFT_TOTALS}
+CLIENT_SHIFT_ZEROS = dict.fromkeys(CLIENT_SHIFT_KEYS.values(), 0.0)
+DEPT_SHIFT_ZEROS = dict.fromkeys(DEPT_SHIFT_KEYS.values(), 0.0)
+
+
+DEFAULT_REQUEST_EMPTY_KEYS = (
+    "selected_year",
+    "selected_months",
+    "selected_quarters",
+    "start_month",
+    "end_month",
+    "emp_id",
+    "account_manager",
+)
 
 
 def is_default_latest_month_request(payload: dict) -> bool:
     """Check whether the request is for default latest-month summary."""
-    return (
-        not payload
-        or (
-            payload.get("clients") in (None, "ALL")
-            and not payload.get("selected_year")
-            and not payload.get("selected_months")
-            and not payload.get("selected_quarters")
-            and not payload.get("start_month")
-            and not payload.get("end_month")
-            and not payload.get("emp_id")
-            and not payload.get("account_manager")
-        )
-    )
+    if not payload:
+        return True
+    if payload.get("clients") not in (None, "ALL"):
+        return False
+    for key in DEFAULT_REQUEST_EMPTY_KEYS:
+        if payload.get(key):
+            return False
+    return True
 
 
 def validate_year(year: int) -> None:
@@ -51,7 +69,8 @@ def validate_year(year: int) -> None:
 def parse_yyyy_mm(value: str) -> date:
     """Parse YYYY-MM string into a date object."""
     try:
-        return datetime.strptime(value, "%Y-%m").date().replace(day=1)
+        year, month = value.split("-")
+        return date(int(year), int(month), 1)
     except Exception as exc:
         raise HTTPException(
             400, "Invalid month format. Expected YYYY-MM"
@@ -90,11 +109,6 @@ def month_range(start: date, end: date) -> List[date]:
     return months
 
 
-def empty_shift_totals() -> Dict[str, float]:
-    """Return zero-initialized shift totals."""
-    return {"A": 0.0, "B": 0.0, "C": 0.0, "PRIME": 0.0}
-
-
 def normalize_clients(
     clients_payload: Optional[dict],
 ) -> tuple[Dict[str, List[str]], Dict[str, str], Dict[tuple, str]]:
@@ -125,17 +139,33 @@ def normalize_clients(
 
 
 def get_latest_month(db: Session) -> date:
-    """Fetch the latest available duration month."""
+    """Fetch the latest available duration month, cached for a few minutes."""
+    cached = cache.get(LATEST_DURATION_MONTH_KEY)
+    if cached:
+        return cached
+
     latest = db.query(func.max(ShiftAllowances.duration_month)).scalar()
     if not latest:
         raise HTTPException(404, "No data available in database")
-    return date(latest.year, latest.month, 1)
 
+    latest_month = date(latest.year, latest.month, 1)
+    cache.set(
+        LATEST_DURATION_MONTH_KEY,
+        latest_month,
+        expire=LATEST_DURATION_MONTH_TTL,
+    )
+    return latest_month
 
-def build_base_query(db: Session):
-    """Build base SQLAlchemy query for client summary."""
+
+def build_base_query():
+    """
+    Build base Core select statement for client summary.
+
+    Allowances are summed in the database, one row per
+    month/client/department/employee/shift type.
+    """
     return (
-        db.query(
+        select(
             ShiftAllowances.duration_month,
             ShiftAllowances.client,
             ShiftAllowances.department,
@@ -143,8 +173,7 @@ def build_base_query(db: Session):
             ShiftAllowances.emp_name,
             ShiftAllowances.account_manager,
             ShiftMapping.shift_type,
-            ShiftMapping.days,
-            ShiftsAmount.amount,
+            func.sum(ShiftMapping.days * ShiftsAmount.amount).label("total"),
         )
         .join(
             ShiftMapping,
@@ -158,9 +187,23 @@ def build_base_query(db: Session):
                 == extract("year", ShiftAllowances.duration_month),
             ),
         )
+        .group_by(
+            ShiftAllowances.duration_month,
+            ShiftAllowances.client,
+            ShiftAllowances.department,
+            ShiftAllowances.emp_id,
+            ShiftAllowances.emp_name,
+            ShiftAllowances.account_manager,
+            ShiftMapping.shift_type,
+        )
     )
 
 
+# Statements are immutable; built once and extended per request with .where(),
+# so SQLAlchemy's compiled cache sees the same base shape every time
+BASE_SUMMARY_STMT = build_base_query()
+
+
 def client_summary_service(db: Session, payload: dict):
     """Return client-wise shift allowance summary."""
     payload = payload or {}
@@ -168,10 +211,18 @@ def client_summary_service(db: Session, payload: dict):
     emp_id = payload.get("emp_id")
     account_manager = payload.get("account_manager")
 
-    if is_default_latest_month_request(payload):
+    is_default = is_default_latest_month_request(payload)
+
+    if is_default:
         cached = cache.get(LATEST_MONTH_KEY)
         if cached:
             return cached["data"]
+        payload_key = None
+    else:
+        payload_key = summary_cache_key(payload)
+        cached = cache.get(payload_key)
+        if cached is not None:
+            return cached
 
     selected_year = payload.get("selected_year")
     selected_months = payload.get("selected_months", [])
@@ -215,7 +266,7 @@ def client_summary_service(db: Session, payload: dict):
     for period in periods:
         response[period] = {"message": f"No data found for {period}"}
 
-    query = build_base_query(db)
+    query = BASE_SUMMARY_STMT
 
     if normalized_clients:
         filters = []
@@ -229,26 +280,27 @@ def client_summary_service(db: Session, payload: dict):
                 )
             else:
                 filters.append(func.lower(ShiftAllowances.client) == client_lc)
-        query = query.filter(or_(*filters))
+        query = query.where(or_(*filters))
 
     if emp_id:
-        query = query.filter(func.lower(ShiftAllowances.emp_id) == emp_id.lower())
+        query = query.where(func.lower(ShiftAllowances.emp_id) == emp_id.lower())
 
     if account_manager:
         if isinstance(account_manager, list):
-            filters = [
-                func.lower(ShiftAllowances.account_manager).like(
-                    f"%{am.strip().lower()}%"
-                )
+            patterns = [
+                f"%{am.strip()}%"
                 for am in account_manager
                 if isinstance(am, str) and am.strip()
             ]
-            if filters:
-                query = query.filter(or_(*filters))
+            if patterns:
+                # One ILIKE ANY(ARRAY[...]) predicate instead of an OR per manager
+                query = query.where(
+                    ShiftAllowances.account_manager.ilike(any_(array(patterns)))
+                )
         else:
-            query = query.filter(
-                func.lower(ShiftAllowances.account_manager).like(
-                    f"%{account_manager.strip().lower()}%"
+            query = query.where(
+                ShiftAllowances.account_manager.ilike(
+                    f"%{account_manager.strip()}%"
                 )
             )
 
@@ -258,32 +310,32 @@ def client_summary_service(db: Session, payload: dict):
         else months
     )
 
-    query = query.filter(
-        or_(
-            *[
-                and_(
-                    extract("year", ShiftAllowances.duration_month) == m.year,
-                    extract("month", ShiftAllowances.duration_month) == m.month,
-                )
-                for m in date_list
-            ]
-        )
-    )
+    query = query.where(duration_month_filter(date_list))
 
-    rows = query.all()
+    # Core execution yields plain rows without ORM query overhead
+    rows = db.execute(query).all()
 
-    for dm, client, dept, eid, ename, acc_mgr, stype, days, amt in rows:
-        period_key = next(
-            (q for q, ml in quarter_map.items() if dm.replace(day=1) in ml),
-            dm.strftime("%Y-%m"),
-        )
+    # O(1) employee lookup per department instead of scanning its list
+    employee_index: Dict[tuple, Dict] = {}
+
+    # Quarter label per month, and the resolved period key per distinct row month
+    month_to_quarter = {m: q for q, ml in quarter_map.items() for m in ml}
+    period_by_month: Dict[date, str] = {}
+
+    for dm, client, dept, eid, ename, acc_mgr, stype, shift_total in rows:
+        period_key = period_by_month.get(dm)
+        if period_key is None:
+            month_start = dm.replace(day=1)
+            period_key = period_by_month[dm] = month_to_quarter.get(
+                month_start, f"{month_start:%Y-%m}"
+            )
 
         if "message" in response.get(period_key, {}):
             response[period_key] = {
                 "clients": {},
                 "month_total": {
                     "total_head_count": 0,
-                    **empty_shift_totals(),
+                    **EMPTY_SHIFT_TOTALS,
                     "total_allowance": 0.0,
                 },
             }
@@ -303,60 +355,59 @@ def client_summary_service(db: Session, payload: dict):
             dept_safe or "UNKNOWN",
         )
 
-        total = float(days or 0) * float(amt or 0)
+        total = float(shift_total or 0)
 
-        client_block = month_block["clients"].setdefault(
-            client_name,
-            {
-                **{f"client_{k}": 0.0 for k in empty_shift_totals()},
+        client_block = month_block["clients"].get(client_name)
+        if client_block is None:
+            client_block = month_block["clients"][client_name] = {
+                **CLIENT_SHIFT_ZEROS,
                 "departments": {},
                 "client_head_count": 0,
                 "client_total": 0.0,
-            },
-        )
+            }
 
-        dept_block = client_block["departments"].setdefault(
-            dept_name,
-            {
-                **{f"dept_{k}": 0.0 for k in empty_shift_totals()},
+        dept_block = client_block["departments"].get(dept_name)
+        if dept_block is None:
+            dept_block = client_block["departments"][dept_name] = {
+                **DEPT_SHIFT_ZEROS,
                 "dept_total": 0.0,
                 "employees": [],
                 "dept_head_count": 0,
-            },
-        )
+            }
 
-        employee = next(
-            (e for e in dept_block["employees"] if e["emp_id"] == eid),
-            None,
-        )
+        employee_key = (period_key, client_name, dept_name, eid)
+        employee = employee_index.get(employee_key)
 
         if not employee:
             employee = {
                 "emp_id": eid,
                 "emp_name": ename,
                 "account_manager": acc_mgr,
-                **empty_shift_totals(),
+                **EMPTY_SHIFT_TOTALS,
                 "total": 0.0,
             }
             dept_block["employees"].append(employee)
+            employee_index[employee_key] = employee
             dept_block["dept_head_count"] += 1
             client_block["client_head_count"] += 1
             month_block["month_total"]["total_head_count"] += 1
 
         employee[stype] += total
         employee["total"] += total
-        dept_block[f"dept_{stype}"] += total
+        dept_block[DEPT_SHIFT_KEYS[stype]] += total
         dept_block["dept_total"] += total
-        client_block[f"client_{stype}"] += total
+        client_block[CLIENT_SHIFT_KEYS[stype]] += total
         client_block["client_total"] += total
         month_block["month_total"][stype] += total
         month_block["month_total"]["total_allowance"] += total
 
-    if is_default_latest_month_request(payload):
+    if is_default:
         cache.set(
             LATEST_MONTH_KEY,
             {"_cached_month": months[0].strftime("%Y-%m"), "data": response},
             expire=CACHE_TTL,
         )
+    else:
+        cache.set(payload_key, response, expire=SUMMARY_CACHE_TTL)
 
     return response
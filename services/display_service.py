@@ -9,10 +9,12 @@ from io import BytesIO
 from fastapi.responses import StreamingResponse
 from utils.client_enums import Company
 from calendar import monthrange
-from diskcache import Cache
-
-cache = Cache("./diskcache/latest_month")
-LATEST_MONTH_KEY = "client_summary:latest_month"
+from utils.summary_cache import (
+    cache,
+    invalidate_latest_export_cache,
+    invalidate_summary_payload_cache,
+    LATEST_MONTH_KEY,
+)
 
 def is_latest_month(db: Session, duration_dt: date) -> bool:
     latest_month = db.query(func.max(ShiftAllowances.duration_month)).scalar()
@@ -332,8 +334,10 @@ def update_shift_service(
         })
 
     db.commit()
+    invalidate_summary_payload_cache()
     if is_latest_month(db, duration_dt):
         cache.pop(LATEST_MONTH_KEY, None)
+        invalidate_latest_export_cache()
 
     return {
         "message": "Shift updated successfully",
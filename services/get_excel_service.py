@@ -1,17 +1,39 @@
 """
-Service for exporting filtered shift allowance data as a Pandas DataFrame.
+Service for exporting filtered shift allowance data as spreadsheet rows.
 """
 
-from typing import Optional
-from datetime import datetime, date
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple
+from datetime import date
 
-import pandas as pd
 from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from models.models import ShiftAllowances, ShiftMapping, ShiftsAmount
+from models.models import ShiftAllowances, ShiftMapping
+from utils.rate_cache import get_shift_rates
+
+
+EXPORT_COLUMNS = [
+    "emp_id",
+    "emp_name",
+    "department",
+    "client",
+    "project",
+    "project_code",
+    "client_partner",
+    "shift_details",
+    "delivery_manager",
+    "practice_lead",
+    "billability_status",
+    "practice_remarks",
+    "rmg_comments",
+    "duration_month",
+    "payroll_month",
+    "total_allowance",
+]
+FETCH_BATCH_SIZE = 1000
 
 
 def _parse_month(month: str, field_name: str) -> date:
@@ -20,7 +42,8 @@ def _parse_month(month: str, field_name: str) -> date:
     the first day of the month.
     """
     try:
-        return datetime.strptime(month, "%Y-%m").date().replace(day=1)
+        year, month_num = month.split("-")
+        return date(int(year), int(month_num), 1)
     except ValueError as exc:
         raise HTTPException(
             status_code=400,
@@ -28,44 +51,50 @@ def _parse_month(month: str, field_name: str) -> date:
         ) from exc
 
 
-def _resolve_latest_month(base_query, current_month: date):
+def _resolve_latest_month(db: Session, base_query, filters: list, current_month: date):
     """
-    Find the latest available month in the last 12 months
-    from the given query.
+    Restrict the query to the latest month with data in the last
+    12 months, found with a single MAX query on shift_allowances alone.
     """
-    for i in range(12):
-        check_month = current_month - relativedelta(months=i)
-        query = base_query.filter(
-            func.date_trunc("month", ShiftAllowances.duration_month) == check_month
+    window_start = current_month - relativedelta(months=11)
+    window_end = current_month + relativedelta(months=1)
+
+    latest = (
+        db.query(func.max(ShiftAllowances.duration_month))
+        .filter(
+            *filters,
+            ShiftAllowances.duration_month >= window_start,
+            ShiftAllowances.duration_month < window_end,
+        )
+        .scalar()
+    )
+    if latest is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No data found in last 12 months",
         )
-        if query.first():
-            return query
 
-    raise HTTPException(
-        status_code=404,
-        detail="No data found in last 12 months",
+    latest_month = latest.replace(day=1)
+    return base_query.filter(
+        ShiftAllowances.duration_month >= latest_month,
+        ShiftAllowances.duration_month < latest_month + relativedelta(months=1),
     )
 
 
-def _calculate_shift_allowances(db, row, shift_labels, allowance_map):
+def _calculate_shift_allowances(mappings, shift_labels, allowance_map):
     """
-    Compute shift entries and total allowance for a single row.
+    Compute shift entries and total allowance from the aggregated
+    (shift_type, days) pairs of a single shift allowance record.
     """
-    mappings = (
-        db.query(ShiftMapping.shift_type, ShiftMapping.days)
-        .filter(ShiftMapping.shiftallowance_id == row.id)
-        .all()
-    )
-
     shift_entries = []
     total_allowance = 0.0
 
-    for mapping in mappings:
-        days = float(mapping.days or 0)
-        if days <= 0:
+    for raw_shift_type, raw_days in mappings:
+        days = float(raw_days or 0)
+        if raw_shift_type is None or days <= 0:
             continue
 
-        shift_type = mapping.shift_type.upper()
+        shift_type = raw_shift_type.upper()
         label = shift_labels.get(shift_type, shift_type)
         rate = allowance_map.get(shift_type, 0)
         shift_total = rate * days
@@ -86,9 +115,9 @@ def export_filtered_excel(
     end_month: Optional[str] = None,
     department: Optional[str] = None,
     client: Optional[str] = None,
-):
+) -> Tuple[List[str], Iterator[tuple]]:
     """
-    Export shift allowance records as a Pandas DataFrame with optional filters.
+    Export shift allowance records as spreadsheet rows with optional filters.
 
     Filters:
     - emp_id
@@ -98,6 +127,8 @@ def export_filtered_excel(
     - start_month / end_month (YYYY-MM)
 
     Returns the latest available month if no month is specified.
+    Rows are returned as a lazy iterator of tuples ordered like
+    `EXPORT_COLUMNS` and are fetched from the database in batches.
     """
     shift_labels = {"A": "A", "B": "B", "C": "C", "PRIME": "PRIME"}
 
@@ -116,28 +147,33 @@ def export_filtered_excel(
         ShiftAllowances.billability_status,
         ShiftAllowances.practice_remarks,
         ShiftAllowances.rmg_comments,
-        ShiftAllowances.duration_month,
-        ShiftAllowances.payroll_month,
+        func.to_char(ShiftAllowances.duration_month, "YYYY-MM").label("duration_month"),
+        func.to_char(ShiftAllowances.payroll_month, "YYYY-MM").label("payroll_month"),
+        func.array_agg(ShiftMapping.shift_type).label("shift_types"),
+        func.array_agg(ShiftMapping.days).label("shift_days"),
+    ).outerjoin(
+        ShiftMapping,
+        ShiftMapping.shiftallowance_id == ShiftAllowances.id,
     )
 
+    filters = []
     if emp_id:
-        base_query = base_query.filter(
-            func.trim(ShiftAllowances.emp_id) == emp_id.strip()
-        )
+        filters.append(func.trim(ShiftAllowances.emp_id) == emp_id.strip())
     if account_manager:
-        base_query = base_query.filter(
+        filters.append(
             func.lower(func.trim(ShiftAllowances.account_manager))
             == account_manager.strip().lower()
         )
     if department:
-        base_query = base_query.filter(
+        filters.append(
             func.lower(func.trim(ShiftAllowances.department))
             == department.strip().lower()
         )
     if client:
-        base_query = base_query.filter(
+        filters.append(
             func.lower(func.trim(ShiftAllowances.client)) == client.strip().lower()
         )
+    base_query = base_query.filter(*filters)
 
     current_month = date.today().replace(day=1)
 
@@ -156,60 +192,53 @@ def export_filtered_excel(
                     status_code=400,
                     detail="start_month cannot be after end_month",
                 )
-            query = base_query.filter(
-                func.date_trunc("month", ShiftAllowances.duration_month) >= start_date,
-                func.date_trunc("month", ShiftAllowances.duration_month) <= end_date,
-            )
         else:
-            query = base_query.filter(
-                func.date_trunc("month", ShiftAllowances.duration_month) == start_date
-            )
+            end_date = start_date
+        query = base_query.filter(
+            ShiftAllowances.duration_month >= start_date,
+            ShiftAllowances.duration_month < end_date + relativedelta(months=1),
+        )
     else:
-        query = _resolve_latest_month(base_query, current_month)
+        query = _resolve_latest_month(db, base_query, filters, current_month)
 
-    rows = query.all()
-    if not rows:
+    # Mappings are collapsed in SQL, one wide row per shift allowance record
+    rows = iter(
+        query.group_by(ShiftAllowances.id)
+        .order_by(ShiftAllowances.id)
+        .yield_per(FETCH_BATCH_SIZE)
+    )
+    first_row = next(rows, None)
+    if first_row is None:
         raise HTTPException(
             status_code=404,
             detail="No records found for given filters",
         )
 
-    allowance_map = {
-        item.shift_type.upper(): float(item.amount or 0)
-        for item in db.query(ShiftsAmount).all()
-    }
+    allowance_map = get_shift_rates(db)
 
-    final_data = []
-    for row in rows:
-        shift_entries, total_allowance = _calculate_shift_allowances(
-            db, row, shift_labels, allowance_map
-        )
+    def _iter_rows():
+        for row in chain((first_row,), rows):
+            shift_entries, total_allowance = _calculate_shift_allowances(
+                zip(row.shift_types, row.shift_days), shift_labels, allowance_map
+            )
 
-        final_data.append(
-            {
-                "emp_id": row.emp_id,
-                "emp_name": row.emp_name,
-                "department": row.department,
-                "client": row.client,
-                "project": row.project,
-                "project_code": row.project_code,
-                "client_partner": row.account_manager,
-                "shift_details": ", ".join(shift_entries) if shift_entries else None,
-                "delivery_manager": row.delivery_manager,
-                "practice_lead": row.practice_lead,
-                "billability_status": row.billability_status,
-                "practice_remarks": row.practice_remarks,
-                "rmg_comments": row.rmg_comments,
-                "duration_month": (
-                    row.duration_month.strftime("%Y-%m")
-                    if row.duration_month else None
-                ),
-                "payroll_month": (
-                    row.payroll_month.strftime("%Y-%m")
-                    if row.payroll_month else None
-                ),
-                "total_allowance": f"₹ {total_allowance:,.2f}",
-            }
-        )
+            yield (
+                row.emp_id,
+                row.emp_name,
+                row.department,
+                row.client,
+                row.project,
+                row.project_code,
+                row.account_manager,
+                ", ".join(shift_entries) if shift_entries else None,
+                row.delivery_manager,
+                row.practice_lead,
+                row.billability_status,
+                row.practice_remarks,
+                row.rmg_comments,
+                row.duration_month,
+                row.payroll_month,
+                f"₹ {total_allowance:,.2f}",
+            )
 
-    return pd.DataFrame(final_data)
+    return EXPORT_COLUMNS, _iter_rows()
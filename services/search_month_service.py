@@ -11,17 +11,11 @@ shift breakdowns are required across one or more months.
 """
 
 from datetime import datetime, date
+from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only, selectinload
 from models.models import ShiftAllowances, ShiftMapping
-
-SHIFT_LABELS = {
-    "A": "A(9PM to 6AM)",
-    "B": "B(4PM to 1AM)",
-    "C": "C(6AM to 3PM)",
-    "PRIME": "PRIME(12AM to 9AM)"
-}
+from utils.shift_labels import SHIFT_LABELS
 
 def search_shift_by_month_range(
     db: Session,
@@ -69,29 +63,31 @@ def search_shift_by_month_range(
     if end_date:
         end_date = end_date.replace(day=1)
 
-    query = db.query(
-        ShiftAllowances.id,
-        ShiftAllowances.emp_id,
-        ShiftAllowances.emp_name,
-        ShiftAllowances.grade,
-        ShiftAllowances.department,
-        ShiftAllowances.client,
-        ShiftAllowances.project,
-        ShiftAllowances.account_manager,
-        ShiftAllowances.duration_month,
-        ShiftAllowances.payroll_month
+    # Mappings arrive in one batched IN query instead of a join that repeats parents
+    query = db.query(ShiftAllowances).options(
+        load_only(
+            ShiftAllowances.emp_id,
+            ShiftAllowances.emp_name,
+            ShiftAllowances.grade,
+            ShiftAllowances.department,
+            ShiftAllowances.client,
+            ShiftAllowances.project,
+            ShiftAllowances.account_manager,
+            ShiftAllowances.duration_month,
+            ShiftAllowances.payroll_month,
+        ),
+        selectinload(ShiftAllowances.shift_mappings).load_only(
+            ShiftMapping.shift_type, ShiftMapping.days
+        ),
     )
 
-    if start_date and end_date:
-        query = query.filter(
-            func.date_trunc("month", ShiftAllowances.duration_month) >= start_date,
-            func.date_trunc("month", ShiftAllowances.duration_month) <= end_date
-        )
-    elif start_date:
-        query = query.filter(
-            func.date_trunc("month", ShiftAllowances.duration_month) == start_date)
-    elif end_date:
-        query = query.filter(func.date_trunc("month", ShiftAllowances.duration_month) == end_date)
+    # Half-open month ranges on the bare column keep the duration_month index usable
+    first_month = start_date or end_date
+    last_month = end_date or start_date
+    query = query.filter(
+        ShiftAllowances.duration_month >= first_month,
+        ShiftAllowances.duration_month < last_month + relativedelta(months=1),
+    )
 
     rows = query.order_by(ShiftAllowances.duration_month, ShiftAllowances.emp_id).all()
 
@@ -100,22 +96,21 @@ def search_shift_by_month_range(
 
     final_data = []
     for row in rows:
-        base = row._asdict()
-        shiftallowance_id = base.pop("id")
-
-
-        base.pop("project_code", None)
-
-
-        base["duration_month"] = row.duration_month.strftime("%Y-%m")
-        base["payroll_month"] = row.payroll_month.strftime("%Y-%m")
-
-        # Fetch shift types and days
+        base = {
+            "emp_id": row.emp_id,
+            "emp_name": row.emp_name,
+            "grade": row.grade,
+            "department": row.department,
+            "client": row.client,
+            "project": row.project,
+            "account_manager": row.account_manager,
+            "duration_month": row.duration_month.strftime("%Y-%m"),
+            "payroll_month": row.payroll_month.strftime("%Y-%m"),
+        }
+
+        # Shift types and days
         shift_output = {}
-        mappings = db.query(ShiftMapping.shift_type, ShiftMapping.days)\
-                     .filter(ShiftMapping.shiftallowance_id == shiftallowance_id).all()
-
-        for m in mappings:
+        for m in row.shift_mappings:
             if m.days is not None:
                 val = float(m.days)
                 if val > 0:
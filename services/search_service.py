@@ -17,18 +17,39 @@ Client filtering supports single client with optional department:
 """
 
 import re
+from collections import defaultdict
 from datetime import datetime, date
+from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy import func, and_
 
-from models.models import ShiftAllowances, ShiftMapping, ShiftsAmount
+from models.models import ShiftAllowances, ShiftMapping
+from utils.month_filters import duration_month_filter
+from utils.shift_labels import SHIFT_LABELS
 from utils.client_enums import Company
+from utils.rate_cache import get_shift_rates
+
+
+YYYY_MM_PATTERN = re.compile(r"\A\d{4}-\d{2}\Z")
+YEAR_PATTERN = re.compile(r"\A\d{4}\Z")
+MONTH_PATTERN = re.compile(r"\A(0?[1-9]|1[0-2])\Z")
+COMPANY_BY_NAME = {company.name: company.value for company in Company}
+EMPLOYEE_FIELDS = (
+    "emp_id",
+    "emp_name",
+    "department",
+    "client",
+    "project",
+    "account_manager",
+    "duration_month",
+    "payroll_month",
+)
 
 
 def validate_year(year: str):
     """Validate selected year is a 4-digit integer and not in future."""
-    if not year.isdigit() or len(year) != 4:
+    if not YEAR_PATTERN.match(year):
         raise HTTPException(400, "selected_year must be a 4-digit year (YYYY)")
     year_int = int(year)
     if year_int > date.today().year:
@@ -38,7 +59,7 @@ def validate_year(year: str):
 
 def validate_month(month: str):
     """Validate month string is 01-12."""
-    if not month.isdigit() or not 1 <= int(month) <= 12:
+    if not MONTH_PATTERN.match(month):
         raise HTTPException(400, "selected_months must be between 01 and 12")
     return int(month)
 
@@ -55,32 +76,29 @@ def normalize_company_name(client: str | None):
     """Normalize client name using Company enum if exists."""
     if not client:
         return None
-    for company in Company:
-        if company.name == client.upper():
-            return company.value
-    return client
+    return COMPANY_BY_NAME.get(client.upper(), client)
 
 
 def apply_client_department_filters(query, client=None, department=None):
     """
     Search-based filtering for client and/or department.
     Works independently or together.
+
+    Substring matches use plain ILIKE on the bare column so the pg_trgm
+    GIN indexes on client and department (see models.ShiftAllowances) can
+    serve them once provisioned; upper()/lower() would bypass those indexes.
     """
     conditions = []
 
     if client and client.strip().upper() != "ALL":
         client_norm = normalize_company_name(client)
         conditions.append(
-            func.upper(ShiftAllowances.client).like(
-                f"%{client_norm.strip().upper()}%"
-            )
+            ShiftAllowances.client.ilike(f"%{client_norm.strip()}%")
         )
 
     if department:
         conditions.append(
-            func.upper(ShiftAllowances.department).like(
-                f"%{department.strip().upper()}%"
-            )
+            ShiftAllowances.department.ilike(f"%{department.strip()}%")
         )
 
     if conditions:
@@ -101,60 +119,69 @@ def get_quarter_months(q):
 
 def get_default_start_month(db: Session) -> str:
     """Get the most recent month with data in the last 12 months."""
-    today = datetime.now().replace(day=1)
-    for i in range(12):
-        y = today.year
-        m = today.month - i
-        if m <= 0:
-            m += 12
-            y -= 1
-        month_str = f"{y:04d}-{m:02d}"
-        exists = db.query(ShiftAllowances.id).filter(
-            func.to_char(ShiftAllowances.duration_month, "YYYY-MM") == month_str
-        ).first()
-        if exists:
-            return month_str
-    raise HTTPException(404, "No data found in the last 12 months")
-
-
-def aggregate_shift_details(db, rows, rates, labels):
-    """Aggregate shift allowance amounts by shift type."""
+    current_month = date.today().replace(day=1)
+    latest = db.query(func.max(ShiftAllowances.duration_month)).filter(
+        ShiftAllowances.duration_month >= current_month - relativedelta(months=11),
+        ShiftAllowances.duration_month < current_month + relativedelta(months=1),
+    ).scalar()
+    if not latest:
+        raise HTTPException(404, "No data found in the last 12 months")
+    return latest.strftime("%Y-%m")
+
+
+def _fetch_mappings_bulk(db, row_ids):
+    """
+    Fetch positive-day shift mappings for the given allowance ids in one
+    query, bucketed as (upper shift type, days) tuples per allowance id.
+    """
+    mappings_by_id = defaultdict(list)
+    if not row_ids:
+        return mappings_by_id
+    mappings = db.query(
+        ShiftMapping.shiftallowance_id,
+        func.upper(ShiftMapping.shift_type),
+        ShiftMapping.days,
+    ).filter(
+        ShiftMapping.shiftallowance_id.in_(row_ids),
+        ShiftMapping.days > 0,
+    ).all()
+    for shiftallowance_id, shift_type, days in mappings:
+        mappings_by_id[shiftallowance_id].append((shift_type, float(days)))
+    return mappings_by_id
+
+
+def aggregate_shift_details(db, row_ids, rates, labels):
+    """Aggregate shift allowance amounts by shift type in SQL."""
     overall = {v: 0.0 for v in labels.values()}
     total = 0.0
-    for row in rows:
-        mappings = db.query(ShiftMapping).filter(
-            ShiftMapping.shiftallowance_id == row.id
-        ).all()
-        for m in mappings:
-            days = float(m.days or 0)
-            if days <= 0:
-                continue
-            rate = rates.get(m.shift_type.upper(), 0)
-            amount = days * rate
-            label = labels.get(m.shift_type.upper(), m.shift_type)
-            overall[label] += amount
-            total += amount
+    shift_type = func.upper(ShiftMapping.shift_type)
+    day_sums = (
+        db.query(shift_type.label("shift_type"), func.sum(ShiftMapping.days))
+        .filter(
+            ShiftMapping.shiftallowance_id.in_(row_ids),
+            ShiftMapping.days > 0,
+        )
+        .group_by(shift_type)
+        .all()
+    )
+    for st, days in day_sums:
+        amount = float(days or 0) * rates.get(st, 0)
+        label = labels.get(st, st)
+        overall[label] = overall.get(label, 0.0) + amount
+        total += amount
     return overall, total
 
 
-def prepare_employee_data(db, rows, rates, labels):
+def prepare_employee_data(mappings_by_id, rows, rates, labels):
     """Prepare employee-wise shift and allowance details."""
     employees = []
     for row in rows:
-        rec = row._asdict()
-        shift_id = rec.pop("id")
+        rec = {field: getattr(row, field) for field in EMPLOYEE_FIELDS}
         emp_shift = {}
         total = 0.0
-        mappings = db.query(ShiftMapping).filter(
-            ShiftMapping.shiftallowance_id == shift_id
-        ).all()
-        for m in mappings:
-            days = float(m.days or 0)
-            if days <= 0:
-                continue
-            rate = rates.get(m.shift_type.upper(), 0)
-            total += days * rate
-            label = labels.get(m.shift_type.upper(), m.shift_type)
+        for shift_type, days in mappings_by_id.get(row.id, ()):
+            total += days * rates.get(shift_type, 0)
+            label = labels.get(shift_type, shift_type)
             emp_shift[label] = emp_shift.get(label, 0) + days
         rec["shift_details"] = {k: int(v) for k, v in emp_shift.items()}
         rec["total_allowance"] = round(total, 2)
@@ -176,17 +203,24 @@ def export_filtered_excel(
     selected_months=None,
     selected_quarters=None,
 ):
-    """Export shift allowances filtered by month, year, quarter, client, or dept."""
+    """
+    Export shift allowances filtered by month, year, quarter, client, or dept.
+
+    Counts, shift totals and the requested page are each computed in SQL,
+    so only `limit` employee rows are fetched.
+    """
     today = date.today()
     allowed_months = set()
     year = None
 
     if selected_year:
         year = validate_year(selected_year)
+        # Last month of the selected year that is not in the future
+        last_open_month = 12 if year < today.year else today.month
         if selected_months:
             for m in selected_months:
                 month_int = validate_month(m)
-                if year == today.year and month_int > today.month:
+                if month_int > last_open_month:
                     raise HTTPException(
                         400, f"Future month {month_int:02d} is not allowed"
                     )
@@ -195,16 +229,11 @@ def export_filtered_excel(
             validate_quarters(selected_quarters)
             for q in selected_quarters:
                 q_months = get_quarter_months(q.upper())
-                if not any(
-                    year < today.year or (year == today.year and m <= today.month)
-                    for m in q_months
-                ):
+                if q_months[0] > last_open_month:
                     raise HTTPException(
                         400, f"{q.upper()} has not started yet and cannot be selected"
                     )
-                for m in q_months:
-                    if year < today.year or (year == today.year and m <= today.month):
-                        allowed_months.add(m)
+                allowed_months.update(m for m in q_months if m <= last_open_month)
         if allowed_months:
             start_month = f"{year}-{min(allowed_months):02d}"
             end_month = f"{year}-{max(allowed_months):02d}"
@@ -214,9 +243,9 @@ def export_filtered_excel(
         start_month = start_month or latest_month
         end_month = end_month or latest_month
 
-    if not re.fullmatch(r"\d{4}-\d{2}", start_month):
+    if not YYYY_MM_PATTERN.match(start_month):
         raise HTTPException(400, "start_month must be in YYYY-MM format")
-    if not re.fullmatch(r"\d{4}-\d{2}", end_month):
+    if not YYYY_MM_PATTERN.match(end_month):
         raise HTTPException(400, "end_month must be in YYYY-MM format")
 
     start_dt = datetime.strptime(start_month, "%Y-%m")
@@ -238,8 +267,7 @@ def export_filtered_excel(
 
     if allowed_months:
         base = base.filter(
-            extract("year", ShiftAllowances.duration_month) == year,
-            extract("month", ShiftAllowances.duration_month).in_(allowed_months)
+            duration_month_filter([date(year, m, 1) for m in allowed_months])
         )
     else:
         base = base.filter(
@@ -248,46 +276,52 @@ def export_filtered_excel(
         )
 
     if emp_id:
-        base = base.filter(func.upper(ShiftAllowances.emp_id).like(f"%{emp_id.upper()}%"))
+        base = base.filter(ShiftAllowances.emp_id.ilike(f"%{emp_id}%"))
     if account_manager:
-        base = base.filter(func.upper(ShiftAllowances.account_manager).like(f"%{account_manager.upper()}%"))
+        base = base.filter(ShiftAllowances.account_manager.ilike(f"%{account_manager}%"))
 
     base = apply_client_department_filters(base, clients, department)
 
-    base = base.order_by(
-        extract("year", ShiftAllowances.duration_month).asc(),
-        extract("month", ShiftAllowances.duration_month).asc(),
-    )
-
-    all_rows = base.all()
-
     if selected_quarters:
         expected_months = {f"{year}-{m:02d}" for m in sorted(allowed_months)}
-        available_months = {r.duration_month for r in all_rows}
+        available_months = {
+            month for (month,) in base.with_entities(
+                func.to_char(ShiftAllowances.duration_month, "YYYY-MM")
+            ).distinct().all()
+        }
         if available_months != expected_months:
             raise HTTPException(
                 404, "No data found for the selected quarter period"
             )
 
-    if not all_rows:
-        raise HTTPException(404, "No data found for the selected period")
-
-    total_records = len(all_rows)
-    headcount = len({r.emp_id for r in all_rows})
+    total_records, headcount = base.with_entities(
+        func.count(ShiftAllowances.id),
+        func.count(func.distinct(ShiftAllowances.emp_id)),
+    ).one()
 
-    labels = {
-        "A": "A(9PM to 6AM)",
-        "B": "B(4PM to 1AM)",
-        "C": "C(6AM to 3PM)",
-        "PRIME": "PRIME(12AM to 9AM)",
-    }
+    if not total_records:
+        raise HTTPException(404, "No data found for the selected period")
 
-    rates = {r.shift_type.upper(): float(r.amount or 0) for r in db.query(ShiftsAmount).all()}
+    rates = get_shift_rates(db)
 
-    overall_shift, overall_total = aggregate_shift_details(db, all_rows, rates, labels)
+    # Overall totals are summed per shift type in SQL over the filtered ids;
+    # only the current page needs individual mapping rows
+    filtered_ids = base.with_entities(ShiftAllowances.id).statement
+    overall_shift, overall_total = aggregate_shift_details(
+        db, filtered_ids, rates, SHIFT_LABELS
+    )
 
-    paginated_rows = all_rows[start:start + limit]
-    employees = prepare_employee_data(db, paginated_rows, rates, labels)
+    # id breaks ties within a month so pages do not overlap
+    paginated_rows = (
+        base.order_by(ShiftAllowances.duration_month.asc(), ShiftAllowances.id.asc())
+        .offset(start)
+        .limit(limit)
+        .all()
+    )
+    mappings_by_id = _fetch_mappings_bulk(db, [r.id for r in paginated_rows])
+    employees = prepare_employee_data(
+        mappings_by_id, paginated_rows, rates, SHIFT_LABELS
+    )
 
     return {
         "total_records": total_records,
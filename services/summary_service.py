@@ -11,12 +11,18 @@ account manager is supported, with strict validation rules.
 """
 
 import re
-from datetime import datetime
-from decimal import Decimal
+from datetime import date, datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
+from sqlalchemy import func
 from fastapi import HTTPException
-from models.models import ShiftAllowances, ShiftsAmount
+from models.models import ShiftAllowances, ShiftMapping
+from utils.month_filters import duration_month_filter
+from utils.rate_cache import get_shift_rates
+
+
+YYYY_MM_PATTERN = re.compile(r"\A\d{4}-\d{2}\Z")
+SHIFT_DAY_FIELDS = {"A": "shift_a", "B": "shift_b", "C": "shift_c", "PRIME": "prime"}
+
 
 def get_client_shift_summary(db: Session,
                              duration_month: str | None = None,
@@ -63,10 +69,13 @@ def get_client_shift_summary(db: Session,
     if duration_month:
         if " " in duration_month:
             raise HTTPException(status_code=400, detail="Spaces are not allowed in duration_month")
-        if not re.match(r"^\d{4}-\d{2}$", duration_month):
+        if not YYYY_MM_PATTERN.match(duration_month):
             raise HTTPException(status_code=400,
                                 detail="Invalid duration_month format. Use YYYY-MM")
         year, month = map(int, duration_month.split("-"))
+        if not 1 <= month <= 12:
+            raise HTTPException(status_code=400,
+                                detail="Invalid duration_month format. Use YYYY-MM")
         month_str = duration_month
     else:
         # No duration_month → pick current month or previous in DB
@@ -83,16 +92,25 @@ def get_client_shift_summary(db: Session,
             raise HTTPException(status_code=404,
                                 detail="No records found for current or previous months")
 
-    # Fetch records
-    query = db.query(ShiftAllowances).filter(
-        extract("year", ShiftAllowances.duration_month) == year,
-        extract("month", ShiftAllowances.duration_month) == month
-    )
+    # Aggregate per account manager and client in SQL
+    am_key = func.coalesce(
+        func.nullif(ShiftAllowances.account_manager, ""), "Unknown"
+    ).label("account_manager")
+    client_key = func.coalesce(
+        func.nullif(ShiftAllowances.client, ""), "Unknown"
+    ).label("client")
+    filters = [duration_month_filter([date(year, month, 1)])]
     if account_manager:
-        query = query.filter(ShiftAllowances.account_manager == account_manager)
-
-    records = query.all()
-    if not records:
+        filters.append(ShiftAllowances.account_manager == account_manager)
+
+    groups = (
+        db.query(am_key, client_key, func.count(func.distinct(ShiftAllowances.emp_id)))
+        .filter(*filters)
+        .group_by(am_key, client_key)
+        .order_by(am_key, client_key)
+        .all()
+    )
+    if not groups:
         raise HTTPException(
     status_code=404,
     detail=(
@@ -100,61 +118,53 @@ def get_client_shift_summary(db: Session,
         f"{f' for manager {account_manager}' if account_manager else ''}"
     )
 )
+
+    shift_type = func.upper(func.trim(ShiftMapping.shift_type)).label("shift_type")
+    day_sums = (
+        db.query(am_key, client_key, shift_type, func.sum(ShiftMapping.days))
+        .join(ShiftMapping, ShiftMapping.shiftallowance_id == ShiftAllowances.id)
+        .filter(*filters)
+        .group_by(am_key, client_key, shift_type)
+        .all()
+    )
+
     # Get shift rates
-    rates = {r.shift_type.upper(): float(r.amount) for r in db.query(ShiftsAmount).all()}
-
-    # Group data
-    summary = {}
-    for row in records:
-        am = row.account_manager or "Unknown"
-        client = row.client or "Unknown"
-
-        if am not in summary:
-            summary[am] = {}
-        if client not in summary[am]:
-            summary[am][client] = {
-                "employees": set(),
-                "shift_a": Decimal(0),
-                "shift_b": Decimal(0),
-                "shift_c": Decimal(0),
-                "prime": Decimal(0),
-                "total_allowances": Decimal(0)
-            }
-
-        summary[am][client]["employees"].add(row.emp_id)
-
-        for mapping in row.shift_mappings:
-            stype = mapping.shift_type.strip().upper()
-            days = Decimal(mapping.days or 0)
-
-            if stype == "A":
-                summary[am][client]["shift_a"] += days
-            elif stype == "B":
-                summary[am][client]["shift_b"] += days
-            elif stype == "C":
-                summary[am][client]["shift_c"] += days
-            elif stype == "PRIME":
-                summary[am][client]["prime"] += days
-
-            rate = Decimal(str(rates.get(stype, 0)))
-            summary[am][client]["total_allowances"] += days * rate
+    rates = get_shift_rates(db)
+
+    summary = {
+        (am, client): {
+            "employees": employees,
+            "shift_a": 0.0,
+            "shift_b": 0.0,
+            "shift_c": 0.0,
+            "prime": 0.0,
+            "total_allowances": 0.0,
+        }
+        for am, client, employees in groups
+    }
+    for am, client, stype, days in day_sums:
+        info = summary[(am, client)]
+        days = float(days or 0)
+        field = SHIFT_DAY_FIELDS.get(stype)
+        if field:
+            info[field] += days
+        info["total_allowances"] += days * rates.get(stype, 0)
 
     #  Build response -
     result = []
-    for am, clients in summary.items():
-        for client, info in clients.items():
-            total_days = float(info["shift_a"] + info["shift_b"] + info["shift_c"] + info["prime"])
-            result.append({
-                "account_manager": am,
-                "client": client,
-                "total_employees": len(info["employees"]),
-                "shift_a_days": float(info["shift_a"]),
-                "shift_b_days": float(info["shift_b"]),
-                "shift_c_days": float(info["shift_c"]),
-                "prime_days": float(info["prime"]),
-                "total_days": total_days,
-                "total_allowances": float(info["total_allowances"]),
-                "duration_month": month_str
-            })
+    for (am, client), info in summary.items():
+        total_days = info["shift_a"] + info["shift_b"] + info["shift_c"] + info["prime"]
+        result.append({
+            "account_manager": am,
+            "client": client,
+            "total_employees": info["employees"],
+            "shift_a_days": info["shift_a"],
+            "shift_b_days": info["shift_b"],
+            "shift_c_days": info["shift_c"],
+            "prime_days": info["prime"],
+            "total_days": total_days,
+            "total_allowances": info["total_allowances"],
+            "duration_month": month_str
+        })
 
     return {month_str: result}
@@ -14,6 +14,10 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from models.models import UploadedFiles, ShiftAllowances, ShiftMapping, ShiftsAmount
+from utils.summary_cache import (
+    invalidate_latest_month_cache,
+    invalidate_summary_payload_cache,
+)
 from schemas.displayschema import CorrectedRow
 from utils.enums import ExcelColumnMap
 
@@ -271,6 +275,8 @@ async def process_excel_upload(file, db: Session, user, base_url: str):
             inserted += 1
 
         db.commit()
+        invalidate_latest_month_cache()
+        invalidate_summary_payload_cache()
 
         if error_rows:
             raise HTTPException(
@@ -474,6 +480,8 @@ def update_corrected_rows(db: Session, corrected_rows: List["CorrectedRow"]):
                     )
 
             db.commit()
+            invalidate_latest_month_cache()
+            invalidate_summary_payload_cache()
 
         except Exception as e:
             db.rollback()
@@ -164,3 +164,7 @@ def generate_unique_colors(enum_cls):
             L = max(55.0, min(90.0, base_L - delta if step % 2 else base_L + delta))
 
     return color_map
+
+
+# Company is fixed at import time, so its colors are computed once here
+COMPANY_COLORS = generate_unique_colors(Company)
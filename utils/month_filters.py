@@ -0,0 +1,35 @@
+"""
+Month range helpers for duration_month filters.
+
+This module builds half-open date range predicates on
+ShiftAllowances.duration_month so filters stay index friendly and
+still match rows stored on any day of the month.
+"""
+
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import and_, or_
+
+from models.models import ShiftAllowances
+
+
+def next_month(value: date) -> date:
+    """Return the first day of the month after the given date."""
+    return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def duration_month_filter(date_list: List[date]):
+    """
+    Build a sargable duration_month filter for the given month-start dates.
+
+    Contiguous months collapse into one half-open range; otherwise each
+    month gets its own range so an index on duration_month stays usable.
+    """
+    months = sorted(set(date_list))
+    column = ShiftAllowances.duration_month
+
+    if all(next_month(prev) == cur for prev, cur in zip(months, months[1:])):
+        return and_(column >= months[0], column < next_month(months[-1]))
+
+    return or_(*[and_(column >= m, column < next_month(m)) for m in months])
@@ -0,0 +1,42 @@
+"""
+Shift rate cache utilities.
+
+This module keeps a process-local copy of the shift type to allowance
+rate map so request handlers do not reload the shifts_amount table on
+every call. Rates are edited directly in the database rather than through
+the ORM, so each lookup checks a cheap one-row signature of the table
+(row count, latest insert and amount total) and reloads the map only
+when that signature changes.
+"""
+
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.models import ShiftsAmount
+
+
+# Rates rarely change; rebuilt only when the table signature moves
+_rates_cache: Dict[str, object] = {"sig": None, "rates": None}
+
+
+def get_shift_rates(db: Session) -> Dict[str, float]:
+    """
+    Return the upper-cased shift type to rate map, reusing the cached copy
+    while the shifts_amount row count, latest insert and amount total are unchanged.
+    """
+    sig = tuple(
+        db.query(
+            func.count(ShiftsAmount.id),
+            func.max(ShiftsAmount.created_at),
+            func.sum(ShiftsAmount.amount),
+        ).one()
+    )
+    if sig != _rates_cache["sig"]:
+        _rates_cache["rates"] = {
+            r.shift_type.upper(): float(r.amount or 0)
+            for r in db.query(ShiftsAmount.shift_type, ShiftsAmount.amount).all()
+        }
+        _rates_cache["sig"] = sig
+    return _rates_cache["rates"]
@@ -0,0 +1,16 @@
+"""
+Shift type display labels.
+
+This module maps shift type codes to the human-readable labels, with
+their working hours, that search responses use as shift keys.
+"""
+
+from types import MappingProxyType
+
+
+SHIFT_LABELS = MappingProxyType({
+    "A": "A(9PM to 6AM)",
+    "B": "B(4PM to 1AM)",
+    "C": "C(6AM to 3PM)",
+    "PRIME": "PRIME(12AM to 9AM)",
+})
@@ -0,0 +1,63 @@
+"""
+Client summary cache keys and invalidation helpers.
+
+This module owns the shared diskcache used by the client summary and
+its Excel export, together with the key names and the helpers that
+write paths call to drop stale entries. Keeping them here lets write
+services invalidate caches without importing the summary services.
+"""
+
+import hashlib
+import json
+
+from cachetools import TTLCache
+from diskcache import Cache
+
+
+cache = Cache("./diskcache/latest_month")
+
+LATEST_MONTH_KEY = "client_summary:latest_month"
+LATEST_EXCEL_KEY = f"{LATEST_MONTH_KEY}:excel"
+CACHE_TTL = 24 * 60 * 60
+LATEST_DURATION_MONTH_KEY = "latest_duration_month"
+LATEST_DURATION_MONTH_TTL = 5 * 60
+SUMMARY_CACHE_PREFIX = "client_summary:payload"
+SUMMARY_CACHE_VERSION_KEY = "client_summary:payload_version"
+SUMMARY_CACHE_TTL = 5 * 60
+
+# Process-local copy of the rendered latest-month workbook, in front of diskcache
+xlsx_bytes_cache = TTLCache(maxsize=2, ttl=CACHE_TTL)
+
+
+def summary_cache_key(payload: dict) -> str:
+    """Build a stable cache key from the payload and the current data version."""
+    version = cache.get(SUMMARY_CACHE_VERSION_KEY, 0)
+    digest = hashlib.blake2b(
+        json.dumps(payload, sort_keys=True, default=str).encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f"{SUMMARY_CACHE_PREFIX}:{version}:{digest}"
+
+
+def invalidate_summary_payload_cache() -> None:
+    """Orphan every cached filtered summary by bumping the key version."""
+    cache.incr(SUMMARY_CACHE_VERSION_KEY, default=0)
+
+
+def invalidate_latest_export_cache() -> None:
+    """Drop the cached latest-month Excel export from both cache layers."""
+    xlsx_bytes_cache.pop(LATEST_MONTH_KEY, None)
+    cache.pop(LATEST_EXCEL_KEY, None)
+
+
+def invalidate_latest_month_cache() -> None:
+    """
+    Drop everything derived from the latest duration month.
+
+    Called after shift allowance uploads, which may add a newer month or
+    change the current one: clears the resolved month, the default
+    latest-month summary and its Excel export.
+    """
+    cache.pop(LATEST_DURATION_MONTH_KEY, None)
+    cache.pop(LATEST_MONTH_KEY, None)
+    invalidate_latest_export_cache()